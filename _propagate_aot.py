@@ -0,0 +1,28 @@
+"""
+Ahead-of-time build of the propagation kernel.
+
+Run `python _propagate_aot.py` once to compile _propagate_batch from propagate_jit into the
+propagate_ext extension module next to this file. The extension does not need numba to run,
+and main.py uses it on machines where numba is not installed; where numba is available the
+parallel JIT kernel is used instead. Rebuild after changing propagate_jit.
+
+The build relies on numba.pycc, which numba has marked for deprecation: importing it emits a
+NumbaPendingDeprecationWarning.
+"""
+import os
+
+from numba.pycc import CC
+
+from propagate_jit import _propagate_batch
+
+cc = CC("propagate_ext")
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+# pycc has no parallel target, so prange compiles to a plain range loop here
+cc.export(
+    "propagate_batch",
+    "Tuple((f8[:,:,:], f8[:,:,:], f8[:,:,:], i8[:,:]))(f8[:,:], f8[:,:], f8[:])",
+)(_propagate_batch.py_func)
+
+if __name__ == "__main__":
+    cc.compile()
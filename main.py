@@ -2,6 +2,16 @@ import networkx as nx
 import matplotlib.pyplot as plt
 import numpy as np
 import random
+import sys
+from functools import lru_cache
+
+try:
+    from propagate_jit import _propagate_batch
+except ImportError:  # numba is not installed
+    try:  # serial ahead-of-time build of the kernel, see _propagate_aot.py
+        from propagate_ext import propagate_batch as _propagate_batch
+    except ImportError:  # propagate_sweep falls back to NumPy
+        _propagate_batch = None
 
 random.seed(1234)
 
@@ -10,10 +20,13 @@ from networkx.classes import number_of_nodes
 
 # Node class
 class Node:
+    __slots__ = ("node_id", "ideology_score", "bias_multiplier")
+
     def __init__(self, node_id, ideology_score, bias_multiplier):
         self.node_id = node_id
-        self.ideology_score = ideology_score
-        self.bias_multiplier = bias_multiplier  # Bias factor for this node
+        # plain floats, so process_message never falls into NumPy scalar arithmetic
+        self.ideology_score = float(ideology_score)
+        self.bias_multiplier = float(bias_multiplier)  # Bias factor for this node
 
     def process_message(self, message_ideology, sensitivity):
         """
@@ -21,26 +34,44 @@ class Node:
         Non-linear drift is applied to amplify or dampen the effect of ideological differences.
         """
 
+        message_ideology = float(message_ideology)
         delta = abs(self.ideology_score - message_ideology)
-        drift = self.bias_multiplier * sensitivity * (delta ** 2)  # Quadratic effect
+        drift = self.bias_multiplier * sensitivity * (delta * delta)  # Quadratic effect
         if self.ideology_score > message_ideology:
             new_ideology = message_ideology + drift
         else:
             new_ideology = message_ideology - drift
-            # Clamp ideology between 0 and 1
-        return np.clip(new_ideology, 0, 1)
+        # Clamp ideology between 0 and 1
+        return float(min(1.0, max(0.0, new_ideology)))
 
 # Message class
 class Message:
+    __slots__ = ("ideology_score",)
+
     def __init__(self, ideology_score):
-        self.ideology_score = ideology_score
+        self.ideology_score = float(ideology_score)
+
+@lru_cache(maxsize=None)
+def _layout(n):
+    """
+    Returns the shell layout positions of a chain of n nodes, as an (n, 2) array.
+    shell_layout only depends on the number and order of the nodes, so the layout is computed
+    once per chain length and shared by every drawn network.
+    """
+    pos = nx.shell_layout(nx.path_graph(n, create_using=nx.DiGraph))
+    positions = np.array([pos[i] for i in range(n)])
+    positions.flags.writeable = False  # shared between calls
+    return positions
 
 # Network class
 class Network:
     def __init__(self):
-        self.graph = nx.DiGraph()
+        self.graph = nx.DiGraph()  # the chain edges are only added by _add_chain_edges
         self.nodes = {}
+        self._node_list = []  # the same Node objects indexed by node id, for the hop loop
         self.last_node_added = 0  # id's of the last node added
+        self._is_chain = True  # False once an edge that skips along the chain has been added
+        self.edge_ideology = {}  # (source, target) -> last message ideology sent along the edge
 
     def draw_graph(self):
         """
@@ -48,7 +79,8 @@ class Network:
         Node sizes are proportional to their ideology scores for clarity.
         Edge labels display message ideology scores.
         """
-        pos = nx.shell_layout(self.graph)
+        self._add_chain_edges()
+        pos = dict(zip(self.graph.nodes, _layout(self.graph.number_of_nodes())))
 
         # Collect node colors based on their ideology scores
         node_colors = [self.nodes[node_id].ideology_score for node_id in self.graph.nodes]
@@ -70,9 +102,8 @@ class Network:
 
         # Add edge labels for message ideology scores
         edge_labels = {
-            (u, v): f"{d['message_ideology']:.2f}"
-            for u, v, d in self.graph.edges(data=True)
-            if "message_ideology" in d
+            edge: f"{message_ideology:.2f}"
+            for edge, message_ideology in self.edge_ideology.items()
         }
         nx.draw_networkx_edge_labels(self.graph, pos, edge_labels=edge_labels, ax=ax)
 
@@ -89,19 +120,27 @@ class Network:
         ax.set_title("Network Visualization with Message Ideology Scores")
         plt.show()
 
+    def _add_chain_edges(self):
+        """
+        Adds the chain to the graph from the node insertion order, connecting each node to the
+        previous one.
+        """
+        node_ids = list(self.nodes)
+        self.graph.add_edges_from(zip(node_ids, node_ids[1:]))
+
     def add_node(self, node_id, bias_multiplier=1.0):
         """
-        Adds a node to the graph and stores the Node object.
-        Automatically connects the new node to the last added node if applicable.
+        Adds a node to the graph and stores the Node object as the next link of the chain.
+        The new node is connected to the last added node when the graph is drawn or searched.
         """
+        if node_id != len(self._node_list):
+            raise ValueError(f"expected node id {len(self._node_list)}, got {node_id}: "
+                             "nodes must be added in id order from 0")
         ideology_score = random.random()  # Random ideology
         node = Node(node_id, ideology_score, bias_multiplier)
         self.nodes[node_id] = node  # Store the Node object
-        self.graph.add_node(node_id, ideology_score=ideology_score, bias_multiplier=bias_multiplier)
-
-        # Automatically connect the new node to the previous node
-        if node_id > 0:  # Skip connecting the first node
-            self.graph.add_edge(self.last_node_added, node_id)
+        self._node_list.append(node)
+        self.graph.add_node(node_id)  # keeps the graph's node order, and so the drawn layout
 
         # Update the last node tracker
         self.last_node_added = node_id
@@ -110,6 +149,8 @@ class Network:
         """
         Adds a directed edge between two nodes in the graph.
         """
+        if target_id != source_id + 1:
+            self._is_chain = False
         self.graph.add_edge(source_id, target_id)
 
     def add_edge_from_last_node(self, target_id):
@@ -117,17 +158,25 @@ class Network:
         Adds a directed edge from the last added node to the target node.
         """
         source_id = self.last_node_added
-        self.graph.add_edge(source_id, target_id)
+        self.add_edge(source_id, target_id)
 
     def propagate_message(self, run_id, source_id, target_id, sensitivity=1.0):
         """
         Simulates message propagation from source to target, adjusting ideology along the path.
-        Stores updated message ideology scores as edge attributes.
+        While only chain edges have been added, the path between two nodes of the chain is the
+        run of consecutive node ids, so the graph is only searched for shortcuts and for
+        endpoints off the chain, which raise the NetworkX errors.
+        Stores updated message ideology scores in edge_ideology, keyed by the edge of each hop.
         """
-        path = nx.shortest_path(self.graph, source=source_id, target=target_id)
+        if self._is_chain and 0 <= source_id <= target_id < len(self._node_list):
+            path = range(source_id, target_id + 1)
+        else:
+            self._add_chain_edges()
+            path = nx.shortest_path(self.graph, source=source_id, target=target_id)
         # print(f"Path: {path}")
 
-        message = Message(self.nodes[source_id].ideology_score)
+        node_list = self._node_list
+        message = Message(node_list[source_id].ideology_score)
         # print(f"Initial message ideology: {message.ideology_score}")
         # use initial_message_ideology to compare change in message
         initial_message_ideology = message.ideology_score
@@ -136,20 +185,20 @@ class Network:
         fail_flag = False  # the message became implausible and did not achieve target
         # Prepare CSV header
         path_length = len(path)
+        rows = []  # CSV rows of this chain
         # Pass the message through each node in the path
         for i in range(path_length - 1):
             current_node_id = path[i]
-            next_node_id = path[i + 1]
 
-            current_node = self.nodes[current_node_id]
+            current_node = node_list[current_node_id]
             before_score = message.ideology_score
             message.ideology_score = current_node.process_message(before_score, sensitivity)
 
             if message.ideology_score == 0 or message.ideology_score == 1:
                 fail_flag = True
 
-            # Store the updated message ideology score as an edge attribute
-            self.graph.edges[current_node_id, next_node_id]["message_ideology"] = message.ideology_score
+            # Store the updated message ideology score for the edge leaving this node
+            self.edge_ideology[current_node_id, path[i + 1]] = message.ideology_score
 
             # leave off the starter node from the output
             if i != 0:
@@ -157,21 +206,142 @@ class Network:
                 fidelity_drift += abs(node_drift)
                 plausibility_drift += node_drift
 
-                print(f"{run_id}, {current_node_id}, "
-                      f"{path_length}, "
-                      f"{initial_message_ideology:.5f}, "
-                      f"{current_node.ideology_score:.5f}, "
-                      f"{sensitivity}, "
-                      f"{current_node.bias_multiplier:.2f}, "
-                      f"{before_score:.5f}, "
-                      f"{message.ideology_score:.5f}, "
-                      f"{fidelity_drift:.5f}, "
-                      f"{plausibility_drift:.5}, {not fail_flag}")
+                rows.append(f"{run_id}, {current_node_id}, "
+                            f"{path_length}, "
+                            f"{initial_message_ideology:.5f}, "
+                            f"{current_node.ideology_score:.5f}, "
+                            f"{sensitivity}, "
+                            f"{current_node.bias_multiplier:.2f}, "
+                            f"{before_score:.5f}, "
+                            f"{message.ideology_score:.5f}, "
+                            f"{fidelity_drift:.5f}, "
+                            f"{plausibility_drift:.5}, {not fail_flag}\n")
             if fail_flag:  # plausibility_drift hit and endpoint
                 break
+        # write the CSV rows of the whole chain at once
+        sys.stdout.write("".join(rows))
         # print(f"Final message ideology at target {target_id}: {message.ideology_score:.3f}")
 
+def propagate_sweep(ideology, bias, sensitivity):
+    """
+    Vectorized counterpart of Network.propagate_message for many independent chains.
+    Row r of ideology and bias holds the node ideology scores and bias multipliers of chain r,
+    and every chain is run once for each message sensitivity in sensitivity.
+    Returns per-hop arrays of shape (num_chains, len(sensitivity), num_nodes - 1): the message
+    ideology before and after each hop, the running fidelity and plausibility drift, the
+    transmission success flag and a mask of the hops that Network.propagate_message would
+    have printed.
+    Uses the compiled kernel from propagate_jit, or from propagate_ext when numba is not
+    installed, and NumPy otherwise.
+    """
+    sensitivity = np.asarray(sensitivity, dtype=np.float64)
+    if _propagate_batch is None:
+        return _propagate_sweep_numpy(ideology, bias, sensitivity)
+
+    after, fidelity, plausibility, fail_idx = _propagate_batch(ideology, bias, sensitivity)
+    start = np.broadcast_to(ideology[:, None, :1], after.shape[:2] + (1,))
+    before = np.concatenate((start, after[:, :, :-1]), axis=2)
+    hop = np.arange(after.shape[2])
+    success = hop < fail_idx[:, :, None]
+    emitted = (hop <= fail_idx[:, :, None]) & (hop != 0)
+    return before, after, fidelity, plausibility, success, emitted
+
+def _propagate_sweep_numpy(ideology, bias, sensitivity):
+    """
+    NumPy implementation of propagate_sweep, advancing all chains and sensitivities one hop at
+    a time so that the node arrays are read once per hop.
+    Messages stop moving once they hit an endpoint, and the loop ends as soon as every message
+    has; like the compiled kernel, the message and drift entries of the hops that were never
+    reached are left unset.
+    """
+    num_chains, path_length = ideology.shape
+    shape = (num_chains, len(sensitivity), path_length - 1)
+    before = np.empty(shape)
+    after = np.empty(shape)
+    fidelity = np.empty(shape)
+    plausibility = np.empty(shape)
+    success = np.zeros(shape, dtype=bool)
+    emitted = np.zeros(shape, dtype=bool)
+
+    msg = np.repeat(ideology[:, :1], len(sensitivity), axis=1)
+    fidelity_drift = np.zeros(shape[:2])
+    plausibility_drift = np.zeros(shape[:2])
+    alive = np.ones(shape[:2], dtype=bool)  # messages that have not hit an endpoint
+    for k in range(path_length - 1):
+        node_ideology = ideology[:, k, None]
+        delta = np.abs(node_ideology - msg)
+        drift = bias[:, k, None] * sensitivity * (delta * delta)  # Quadratic effect
+        new_msg = np.clip(np.where(node_ideology > msg, msg + drift, msg - drift), 0.0, 1.0)
+        new_msg = np.where(alive, new_msg, msg)  # failed messages keep their final ideology
+
+        # leave off the starter node from the output, and stop reporting failed chains
+        emitted[:, :, k] = alive & (k != 0)
+        if k != 0:
+            node_drift = new_msg - msg
+            fidelity_drift += np.abs(node_drift)
+            plausibility_drift += node_drift
+        alive &= (new_msg != 0.0) & (new_msg != 1.0)
+
+        before[:, :, k] = msg
+        after[:, :, k] = new_msg
+        fidelity[:, :, k] = fidelity_drift
+        plausibility[:, :, k] = plausibility_drift
+        success[:, :, k] = alive
+        msg = new_msg
+        if not alive.any():  # the remaining hops are neither emitted nor successful
+            break
+    return before, after, fidelity, plausibility, success, emitted
+
+# one CSV row, in the format of Network.propagate_message
+_ROW_FORMAT = "{}, {}, {}, {:.5f}, {:.5f}, {}, {:.2f}, {:.5f}, {:.5f}, {:.5f}, {:.5}, {}\n"
+
+def format_sweep(ideology, bias, sensitivity, results, first_run_id=0):
+    """
+    Returns the CSV text for a sweep computed by propagate_sweep over chains that share a bias
+    range. Run ids are numbered from first_run_id by sensitivity, then chain.
+    The emitted hops are gathered into one column array per field and formatted in a single
+    pass over the rows.
+    """
+    before, after, fidelity, plausibility, success, emitted = results
+    num_chains, path_length = ideology.shape
+    # nonzero walks (sensitivity, chain, hop) in order, which is the run id order
+    s, c, k = np.nonzero(emitted.transpose(1, 0, 2))
+    columns = (
+        first_run_id + s * num_chains + c,
+        k,
+        np.full(len(k), path_length),
+        ideology[c, 0],
+        ideology[c, k],
+        np.asarray(sensitivity, dtype=object)[s],  # printed as given, like propagate_message
+        bias[c, k],
+        before[c, s, k],
+        after[c, s, k],
+        fidelity[c, s, k],
+        plausibility[c, s, k],
+        success[c, s, k],
+    )
+    return "".join(map(_ROW_FORMAT.format, *(column.tolist() for column in columns)))
+
+def run_bias_range(bias, seeds, first_run_id, num_nodes, sensitivity):
+    """
+    Draws one chain of num_nodes nodes per seed, with bias multipliers in the bias range, and
+    propagates a message along every chain for each sensitivity.
+    Each chain gets its own generator, so the result only depends on the arguments.
+    Returns the CSV text.
+    """
+    chain_ideology = np.empty((len(seeds), num_nodes))
+    chain_bias = np.empty((len(seeds), num_nodes))
+    for j, seed in enumerate(seeds):
+        chain_rng = np.random.default_rng(seed)
+        chain_ideology[j] = chain_rng.random(num_nodes)
+        chain_bias[j] = chain_rng.uniform(bias[0], bias[1], num_nodes)
+
+    # every sensitivity runs on the same chains in one pass
+    results = propagate_sweep(chain_ideology, chain_bias, sensitivity)
+    return format_sweep(chain_ideology, chain_bias, sensitivity, results, first_run_id)
+
 num_nodes_in_chain = 10
+num_repetitions = 10  # chains drawn per bias range
 bias_range = [(0.5, 1.0), (0.5, 2.0), (0.5, 3.0)]
 sensitivity = [.5, 1.0, 1.5, 2.0 ]
 # Example Usage
@@ -180,14 +350,13 @@ if __name__ == "__main__":
   print("Run ID, Node ID, Path Length, Initial Msg Ideology, Node Ideology, "
         "Sensitivity, Bias_Multiplier, Init Msg Ideo Score, Msg Ideo Score, "
         "fidelity_drift, plausibility_drift, Transmission Success")
-  run_id = 0
-  for bias in bias_range:
-      for s in sensitivity:
-          for j in range(10):
-              network = Network()
-              for node_id in range(num_nodes_in_chain):
-                  network.add_node(node_id, bias_multiplier=random.uniform(bias[0], bias[1]))
-              network.propagate_message(run_id, 0, num_nodes_in_chain - 1, sensitivity=s)
-              run_id += 1
-              # Visualize the network
-              # network.draw_graph()
\ No newline at end of file
+  # one seeded stream per chain, so a chain's nodes do not depend on the other bias ranges
+  seeds = np.random.SeedSequence(1234).spawn(len(bias_range) * num_repetitions)
+  # the bias ranges run one after another; only the numba JIT kernel uses several threads
+  text = "".join(
+      run_bias_range(bias, seeds[b * num_repetitions:(b + 1) * num_repetitions],
+                     b * len(sensitivity) * num_repetitions, num_nodes_in_chain, sensitivity)
+      for b, bias in enumerate(bias_range)
+  )
+  # one write for the whole sweep instead of a print per hop
+  sys.stdout.write(text)
@@ -0,0 +1,62 @@
+import numba as nb
+import numpy as np
+
+
+@nb.njit(cache=True, fastmath=True)
+def _propagate(ideology, bias, sensitivity, start_msg, after, fidelity, plausibility):
+    """
+    Propagates a message with ideology start_msg along one chain of nodes.
+    The message ideology and the running fidelity/plausibility drift after each hop are written
+    into after, fidelity and plausibility. Returns (msg, fidelity_drift, plausibility_drift,
+    fail_idx), where fail_idx is the hop at which the message hit an endpoint, or the number
+    of hops if it reached the target.
+    """
+    num_hops = len(ideology) - 1
+    msg = start_msg
+    fidelity_drift = 0.0  # cumulative add of abs(drift), how much change
+    plausibility_drift = 0.0  # cumulative add of drift, if hits endpoints, we don't believe it
+    for i in range(num_hops):
+        delta = abs(ideology[i] - msg)
+        drift = bias[i] * sensitivity * (delta * delta)  # Quadratic effect
+        if ideology[i] > msg:
+            new_msg = msg + drift
+        else:
+            new_msg = msg - drift
+        new_msg = min(1.0, max(0.0, new_msg))
+
+        # leave off the starter node from the drift totals
+        if i != 0:
+            node_drift = new_msg - msg
+            fidelity_drift += abs(node_drift)
+            plausibility_drift += node_drift
+        msg = new_msg
+
+        after[i] = msg
+        fidelity[i] = fidelity_drift
+        plausibility[i] = plausibility_drift
+        if msg == 0.0 or msg == 1.0:
+            return msg, fidelity_drift, plausibility_drift, i
+    return msg, fidelity_drift, plausibility_drift, num_hops
+
+
+@nb.njit(cache=True, fastmath=True, parallel=True)
+def _propagate_batch(ideology, bias, sensitivity):
+    """
+    Runs _propagate over every row of the (num_chains, num_nodes) ideology and bias arrays and
+    every entry of sensitivity, in parallel across chains.
+    Returns the per-hop after, fidelity and plausibility arrays, of shape
+    (num_chains, len(sensitivity), num_nodes - 1), and the fail_idx of each chain and
+    sensitivity; entries past fail_idx are left unset.
+    """
+    num_chains, path_length = ideology.shape
+    shape = (num_chains, len(sensitivity), path_length - 1)
+    after = np.empty(shape)
+    fidelity = np.empty(shape)
+    plausibility = np.empty(shape)
+    fail_idx = np.empty(shape[:2], dtype=np.int64)
+    for c in nb.prange(num_chains):
+        # a chain's nodes stay in cache across its sensitivities
+        for s in range(len(sensitivity)):
+            fail_idx[c, s] = _propagate(ideology[c], bias[c], sensitivity[s], ideology[c, 0],
+                                        after[c, s], fidelity[c, s], plausibility[c, s])[3]
+    return after, fidelity, plausibility, fail_idx
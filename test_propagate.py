@@ -0,0 +1,144 @@
+import contextlib
+import io
+import unittest
+from unittest import mock
+
+import networkx as nx
+import numpy as np
+
+import main
+
+try:
+    import propagate_jit
+except ImportError:  # numba is not installed
+    propagate_jit = None
+
+try:
+    import propagate_ext
+except ImportError:  # the AOT build has not been run, see _propagate_aot.py
+    propagate_ext = None
+
+chain_lengths = [1, 2, 3, 10, 17]
+# (5, 20) saturates most messages and (50, 100) all of them, which ends the NumPy loop early
+bias_range = [(0.5, 1.0), (0.5, 3.0), (5.0, 20.0), (50.0, 100.0)]
+sensitivity = [.5, 1.0, 2.0]
+num_chains = 8
+
+
+def network_from_arrays(ideology, bias):
+    """
+    Returns a Network holding one chain with the given node ideology scores and bias multipliers.
+    """
+    network = main.Network()
+    for node_id, (node_ideology, node_bias) in enumerate(zip(ideology, bias)):
+        network.add_node(node_id, bias_multiplier=node_bias)
+        network.nodes[node_id].ideology_score = float(node_ideology)
+    return network
+
+
+def network_csv(ideology, bias, sensitivity):
+    """
+    Returns the CSV text of Network.propagate_message for every chain and sensitivity, with
+    run ids numbered by sensitivity, then chain.
+    """
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        for s, run_sensitivity in enumerate(sensitivity):
+            for c in range(len(ideology)):
+                network = network_from_arrays(ideology[c], bias[c])
+                network.propagate_message(s * len(ideology) + c, 0, len(ideology[c]) - 1,
+                                          sensitivity=run_sensitivity)
+    return out.getvalue()
+
+
+def sweep_csv(ideology, bias, sensitivity):
+    """
+    Returns the CSV text of format_sweep for the same chains.
+    """
+    results = main.propagate_sweep(ideology, bias, sensitivity)
+    return main.format_sweep(ideology, bias, sensitivity, results)
+
+
+class PropagateSweepTest(unittest.TestCase):
+    """
+    Every backend of propagate_sweep must print the same CSV as Network.propagate_message.
+    """
+
+    def check_backend(self, propagate_batch):
+        rng = np.random.default_rng(1234)
+        with mock.patch.object(main, "_propagate_batch", propagate_batch):
+            for num_nodes in chain_lengths:
+                for bias in bias_range:
+                    with self.subTest(num_nodes=num_nodes, bias=bias):
+                        ideology = rng.random((num_chains, num_nodes))
+                        chain_bias = rng.uniform(bias[0], bias[1], ideology.shape)
+                        self.assertEqual(sweep_csv(ideology, chain_bias, sensitivity),
+                                         network_csv(ideology, chain_bias, sensitivity))
+
+    def test_numpy(self):
+        self.check_backend(None)
+
+    @unittest.skipIf(propagate_jit is None, "numba is not installed")
+    def test_jit(self):
+        self.check_backend(propagate_jit._propagate_batch)
+
+    @unittest.skipIf(propagate_ext is None, "propagate_ext has not been built")
+    def test_aot(self):
+        self.check_backend(propagate_ext.propagate_batch)
+
+
+class NetworkPathTest(unittest.TestCase):
+    """
+    Network.propagate_message walks the chain of consecutive node ids without a graph search
+    only while the nodes and edges form that chain, and searches the graph otherwise.
+    """
+
+    def setUp(self):
+        # with bias and sensitivity at most 1 a message never passes a node, so it never fails
+        self.network = network_from_arrays(np.linspace(0.1, 0.9, 10), np.full(10, 0.5))
+
+    def propagate(self, source_id, target_id, searched):
+        """
+        Propagates a message from source_id to target_id, checks whether the graph was
+        searched, and returns the edges the message crossed.
+        """
+        self.network.edge_ideology.clear()
+        with mock.patch.object(nx, "shortest_path", wraps=nx.shortest_path) as shortest_path, \
+                contextlib.redirect_stdout(io.StringIO()):
+            self.network.propagate_message(0, source_id, target_id)
+        self.assertEqual(shortest_path.called, searched)
+        return list(self.network.edge_ideology)
+
+    def test_chain(self):
+        self.assertEqual(self.propagate(2, 6, searched=False), [(2, 3), (3, 4), (4, 5), (5, 6)])
+
+    def test_forward_shortcut(self):
+        self.network.add_edge(0, 4)
+        self.assertEqual(self.propagate(0, 9, searched=True),
+                         [(0, 4), (4, 5), (5, 6), (6, 7), (7, 8), (8, 9)])
+
+    def test_backward_shortcut(self):
+        self.network.add_edge(5, 3)
+        self.assertEqual(self.propagate(5, 3, searched=True), [(5, 3)])
+        self.assertEqual(self.propagate(0, 3, searched=True), [(0, 1), (1, 2), (2, 3)])
+
+    def test_reversed_pair(self):
+        with self.assertRaises(nx.NetworkXNoPath):
+            self.propagate(5, 2, searched=True)
+
+    def test_unknown_target(self):
+        with self.assertRaises(nx.NodeNotFound):
+            self.propagate(0, 12, searched=True)
+
+    def test_out_of_order_nodes(self):
+        network = main.Network()
+        network.add_node(0)
+        with self.assertRaises(ValueError):
+            network.add_node(2)
+        with self.assertRaises(ValueError):
+            network.add_node(0)
+        self.assertEqual(list(network.nodes), [0])
+
+
+if __name__ == "__main__":
+    unittest.main()